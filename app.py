@@ -1,19 +1,19 @@
 import os
-import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Optional, Tuple, Dict, List
 import requests
+import requests_cache
 import streamlit as st
 import folium
 from folium.plugins import HeatMap
 from datetime import datetime
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.colors as colors
 import io
 import pandas as pd
-import streamlit.components.v1 as components
-from PIL import Image
+from streamlit_folium import st_folium
 import base64
 
 # --------------------------
@@ -28,6 +28,8 @@ if "splash_shown" not in st.session_state:
     st.session_state.splash_shown = False
 
 if not st.session_state.splash_shown:
+    # overlay fades itself out via CSS while the real UI renders underneath;
+    # it is not re-emitted on later reruns, so Streamlit drops it from the page
     st.markdown(
         """
         <style>
@@ -35,9 +37,13 @@ if not st.session_state.splash_shown:
             display: flex;
             justify-content: center;
             align-items: center;
+            position: fixed;
+            inset: 0;
+            z-index: 999999;
             height: 100vh;
             background: black;
             margin: 0;
+            animation: fadeOut 0.4s ease-in-out 1.2s forwards;
         }
         .splash-logo {
             width: 320px;
@@ -47,6 +53,9 @@ if not st.session_state.splash_shown:
             from {opacity: 0; transform: scale(0.95);} 
             to {opacity: 1; transform: scale(1);} 
         }
+        @keyframes fadeOut {
+            to {opacity: 0; visibility: hidden;}
+        }
         </style>
 
         <div class="splash-container">
@@ -55,11 +64,7 @@ if not st.session_state.splash_shown:
         """,
         unsafe_allow_html=True,
     )
-
-    # short pause then rerun
-    time.sleep(1.6)
     st.session_state.splash_shown = True
-    st.rerun()
 
 # ---------------------------------------------------
 #             BACKGROUND IMAGE SETTINGS
@@ -78,36 +83,43 @@ def get_base64_image(image_path: str) -> Tuple[Optional[str], Optional[str]]:
         return None, None
 
 
-if os.path.exists(DEFAULT_IMAGE_PATH):
-    base64_img, mime_type = get_base64_image(DEFAULT_IMAGE_PATH)
-    if base64_img:
-        st.markdown(
-            f"""
-            <style>
-            .stApp {{
-                background: url("data:{mime_type};base64,{base64_img}");
-                background-size: cover;
-                background-position: center;
-                background-repeat: no-repeat;
-                background-attachment: fixed;
-
-                /* rendering hints */
-                image-rendering: -webkit-optimize-contrast;
-                image-rendering: crisp-edges;
-                image-rendering: high-quality;
-            }}
-
-            .main {{
-                background: rgba(255,255,255,0.16);
-                padding: 12px;
-                border-radius: 10px;
-            }}
-
-            h1, h2, h3 {{ color: #fff; text-shadow: 0 0 10px rgba(0,0,0,0.8); }}
-            </style>
-            """,
-            unsafe_allow_html=True,
-        )
+@st.cache_resource
+def get_background_css(image_path: str) -> str:
+    """Builds the background <style> block once per process ("" if the image is missing)"""
+    if not os.path.exists(image_path):
+        return ""
+    base64_img, mime_type = get_base64_image(image_path)
+    if not base64_img:
+        return ""
+    return f"""
+        <style>
+        .stApp {{
+            background: url("data:{mime_type};base64,{base64_img}");
+            background-size: cover;
+            background-position: center;
+            background-repeat: no-repeat;
+            background-attachment: fixed;
+
+            /* rendering hints */
+            image-rendering: -webkit-optimize-contrast;
+            image-rendering: crisp-edges;
+            image-rendering: high-quality;
+        }}
+
+        .main {{
+            background: rgba(255,255,255,0.16);
+            padding: 12px;
+            border-radius: 10px;
+        }}
+
+        h1, h2, h3 {{ color: #fff; text-shadow: 0 0 10px rgba(0,0,0,0.8); }}
+        </style>
+        """
+
+
+background_css = get_background_css(DEFAULT_IMAGE_PATH)
+if background_css:
+    st.markdown(background_css, unsafe_allow_html=True)
 
 
 # ---------------------------------------------------
@@ -115,34 +127,106 @@ if os.path.exists(DEFAULT_IMAGE_PATH):
 # ---------------------------------------------------
 
 def safe_float(val) -> Optional[float]:
+    if val is None:
+        return None
+    # fast path for already-numeric API values; NaN is the only value != itself
+    if isinstance(val, (int, float)):
+        return None if val != val else float(val)
     try:
-        if val is None or val == "" or str(val).lower() == "nan":
+        if val == "" or str(val).lower() == "nan":
             return None
         return float(val)
     except Exception:
         return None
 
 
-@st.cache_data(ttl=900)
-def get_coordinates(city_name: str) -> Optional[Tuple[float, float]]:
+@st.cache_resource(show_spinner=False)
+def get_http_session() -> requests.Session:
+    """Shared keep-alive session with a persistent SQLite response cache."""
+    return requests_cache.CachedSession(
+        "aerosyn_http",
+        backend="sqlite",
+        use_cache_dir=True,
+        expire_after=600,
+        allowable_codes=(200,),
+        urls_expire_after={
+            "geocoding-api.open-meteo.com": 86400,
+            "nominatim.openstreetmap.org": 86400,
+            "api.open-meteo.com": 600,
+        },
+    )
+
+
+# Nominatim's usage policy allows at most one request per second
+NOMINATIM_MIN_INTERVAL = 1.0
+
+
+@st.cache_resource(show_spinner=False)
+def get_nominatim_throttle() -> dict:
+    """Process-wide lock and last-request time shared by every Nominatim call."""
+    return {"lock": threading.Lock(), "last": 0.0}
+
+
+def nominatim_search(city_name: str) -> list:
+    throttle = get_nominatim_throttle()
+    url = f"https://nominatim.openstreetmap.org/search?q={requests.utils.quote(city_name)}&format=json&limit=1"
+    with throttle["lock"]:
+        wait = throttle["last"] + NOMINATIM_MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            return get_http_session().get(url, headers={"User-Agent": "AeroSynApp"}, timeout=8).json()
+        finally:
+            throttle["last"] = time.monotonic()
+
+
+# city -> coords is effectively static, so keep it on disk across restarts.
+# Misses and network errors raise out of the cached function so only hits are persisted.
+@st.cache_data(persist="disk", max_entries=5000, show_spinner=False)
+def fetch_coordinates(city_name: str, use_fallback: bool = True) -> Tuple[float, float]:
+    url = f"https://geocoding-api.open-meteo.com/v1/search?name={requests.utils.quote(city_name)}"
+    res = get_http_session().get(url, timeout=10).json()
+    if isinstance(res, dict) and res.get("results"):
+        lat = float(res["results"][0]["latitude"])
+        lon = float(res["results"][0]["longitude"])
+        return lat, lon
+
+    res = nominatim_search(city_name) if use_fallback else None
+    if res:
+        return float(res[0]["lat"]), float(res[0]["lon"])
+    raise LookupError(f"No geocoding match for {city_name!r}")
+
+
+def get_coordinates(city_name: str, use_fallback: bool = True) -> Optional[Tuple[float, float]]:
     try:
-        url = f"https://geocoding-api.open-meteo.com/v1/search?name={requests.utils.quote(city_name)}"
-        res = requests.get(url, timeout=10).json()
-        if isinstance(res, dict) and res.get("results"):
-            lat = float(res["results"][0]["latitude"])
-            lon = float(res["results"][0]["longitude"])
-            return lat, lon
-
-        fallback = f"https://nominatim.openstreetmap.org/search?q={requests.utils.quote(city_name)}&format=json&limit=1"
-        res = requests.get(fallback, headers={"User-Agent": "AeroSynApp"}, timeout=8).json()
-        if res:
-            return float(res[0]["lat"]), float(res[0]["lon"])
-        return None
+        return fetch_coordinates(city_name, use_fallback)
     except Exception:
         return None
 
 
-@st.cache_data(ttl=600)
+def get_coordinates_batch(cities: List[str]) -> Dict[str, Optional[Tuple[float, float]]]:
+    """Resolves several cities concurrently; keys follow first appearance, duplicates and blanks dropped."""
+    # Streamlit-internal API: imported here so a future move only breaks this helper, not the app
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+    unique = list(dict.fromkeys(c.strip() for c in cities if c and c.strip()))
+    if not unique:
+        return {}
+    # workers share the caller's script context so the st.cache_* lookups behave as in the main thread
+    ctx = get_script_run_ctx()
+    # only the Open-Meteo lookups run concurrently
+    with ThreadPoolExecutor(
+        max_workers=min(8, len(unique)), initializer=add_script_run_ctx, initargs=(None, ctx)
+    ) as pool:
+        results = dict(zip(unique, pool.map(partial(get_coordinates, use_fallback=False), unique)))
+    # misses fall back to Nominatim one at a time, throttled to its 1 req/s policy
+    for city, coords in results.items():
+        if coords is None:
+            results[city] = get_coordinates(city)
+    return results
+
+
+@st.cache_data(ttl=600, max_entries=500)
 def get_open_meteo(lat: float, lon: float) -> Optional[dict]:
     try:
         url = (
@@ -152,40 +236,86 @@ def get_open_meteo(lat: float, lon: float) -> Optional[dict]:
             "&daily=temperature_2m_max,temperature_2m_min,precipitation_sum,uv_index_max,sunrise,sunset"
             "&current_weather=true&timezone=auto"
         )
-        return requests.get(url, timeout=12).json()
+        return get_http_session().get(url, timeout=12).json()
     except Exception:
         return None
 
 
+@st.cache_resource
+def get_rng() -> np.random.Generator:
+    """Process-wide generator, seeded once, for the synthetic heatmap samples."""
+    return np.random.default_rng()
+
+
 def get_current_month() -> int:
     return datetime.now().month
 
 
-def is_crop_in_season(crop: str, current_month: int) -> Tuple[bool, str]:
-    crop_l = (crop or "").lower()
-    kharif = range(6, 10)  # Jun-Sep
-    rabi = range(10, 4 + 13)  # Oct-Feb (wrap handled below)
+def rice_pest_risk(avg_temp: float, high_humidity_hours: int) -> Optional[str]:
+    if avg_temp >= 24 and high_humidity_hours >= 8:
+        return f"🍚 HIGH RISK: Sustained {high_humidity_hours}h of high humidity detected."
+    return None
+
+
+def tomato_pest_risk(avg_temp: float, high_humidity_hours: int) -> Optional[str]:
+    if avg_temp < 28 and high_humidity_hours >= 10:
+        return f"🍅 BLIGHT RISK: Mild temp and {high_humidity_hours}h high humidity — consider protective measures."
+    return None
+
+
+# Per-crop rules keyed by the lowercased sidebar option:
+#   season: (planting months, message when in season, message when not) or None
+#   pest_risk: callable(avg_temp, high_humidity_hours) -> warning or None
+DEFAULT_CROP_RULES = {
+    "season": None,
+    "fertilizer": "Follow soil test recommendations.",
+    "pest_risk": None,
+}
+CROP_TABLE = {
+    "paddy (rice)": {
+        # Kharif, Jun-Sep
+        "season": (
+            frozenset({6, 7, 8, 9}),
+            "Kharif season — ideal for rice planting.",
+            "Kharif season — ideal for rice planting.",
+        ),
+        "fertilizer": "NPK 75:30:30 kg/ha — split top dressings recommended.",
+        "pest_risk": rice_pest_risk,
+    },
+    "wheat": {
+        # Rabi, Oct-Feb
+        "season": (
+            frozenset({10, 11, 12, 1, 2}),
+            "Perfect Rabi season — go for wheat now.",
+            "Not ideal time for wheat planting.",
+        ),
+        "fertilizer": "NPK 100:40:20 kg/ha — ensure nitrogen at tillering.",
+        "pest_risk": None,
+    },
+    "tomato": {
+        "season": None,
+        "fertilizer": "NPK 100:60:100 + calcium spray to prevent BER.",
+        "pest_risk": tomato_pest_risk,
+    },
+}
+
+
+def get_crop_rules(crop: str) -> dict:
+    return CROP_TABLE.get((crop or "").lower(), DEFAULT_CROP_RULES)
 
-    # simple logic
-    if "paddy" in crop_l or "rice" in crop_l:
-        return (current_month in kharif), "Kharif season — ideal for rice planting."
-    if "wheat" in crop_l:
-        # rabi months Oct-Feb
-        if current_month in (10, 11, 12, 1, 2):
-            return True, "Perfect Rabi season — go for wheat now."
-        return False, "Not ideal time for wheat planting."
-    return True, "Check local extension services for exact timing."
+
+def is_crop_in_season(crop: str, current_month: int) -> Tuple[bool, str]:
+    season = get_crop_rules(crop)["season"]
+    if season is None:
+        return True, "Check local extension services for exact timing."
+    months, in_season_msg, off_season_msg = season
+    if current_month in months:
+        return True, in_season_msg
+    return False, off_season_msg
 
 
 def recommend_fertilizer(crop: str) -> str:
-    crop_l = (crop or "").lower()
-    if "paddy" in crop_l or "rice" in crop_l:
-        return "NPK 75:30:30 kg/ha — split top dressings recommended."
-    if "wheat" in crop_l:
-        return "NPK 100:40:20 kg/ha — ensure nitrogen at tillering."
-    if "tomato" in crop_l:
-        return "NPK 100:60:100 + calcium spray to prevent BER."
-    return "Follow soil test recommendations."
+    return get_crop_rules(crop)["fertilizer"]
 
 
 def pest_risk_advice_advanced(crop: str, hourly_data: Dict[str, List]) -> str:
@@ -197,60 +327,114 @@ def pest_risk_advice_advanced(crop: str, hourly_data: Dict[str, List]) -> str:
     if len(temps) < 1 or len(hums) < 1:
         return "Not enough detailed hourly data for a reliable pest risk assessment."
 
-    # use last 24 values where available
-    temp_24 = [t for t in temps[-24:] if t is not None]
-    hum_24 = [h for h in hums[-24:] if h is not None]
+    # use last 24 values where available; tuples keep the cache key small and hashable
+    return assess_pest_risk(crop, tuple(temps[-24:]), tuple(hums[-24:]))
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def assess_pest_risk(crop: str, temps_24: tuple, hums_24: tuple) -> str:
+    # missing readings (None) become NaN
+    temp_24 = np.asarray(temps_24, dtype=np.float32)
+    hum_24 = np.asarray(hums_24, dtype=np.float32)
+
+    temp_24 = temp_24[~np.isnan(temp_24)]
+    avg_temp = float(temp_24.mean()) if temp_24.size else None
+    high_humidity_hours = int(np.count_nonzero(hum_24 > 90))
 
-    avg_temp = sum(temp_24) / len(temp_24) if temp_24 else None
-    high_humidity_hours = sum(1 for h in hum_24 if h > 90) if hum_24 else 0
+    pest_risk = get_crop_rules(crop)["pest_risk"]
+    msg = pest_risk(avg_temp, high_humidity_hours) if pest_risk and avg_temp is not None else None
 
-    msg = []
-    crop_l = (crop or "").lower()
+    return msg or "🟢 Low pest/disease risk based on recent weather conditions."
 
-    if ("paddy" in crop_l or "rice" in crop_l) and avg_temp is not None:
-        if avg_temp >= 24 and high_humidity_hours >= 8:
-            msg.append(f"🍚 HIGH RISK: Sustained {high_humidity_hours}h of high humidity detected.")
 
-    if "tomato" in crop_l and avg_temp is not None:
-        if avg_temp < 28 and high_humidity_hours >= 10:
-            msg.append(f"🍅 BLIGHT RISK: Mild temp and {high_humidity_hours}h high humidity — consider protective measures.")
+MAX_UPLOAD_BYTES = 20_000_000
+# compressed size says little about decoded size, so also cap the pixel count
+MAX_IMAGE_PIXELS = 40_000_000
 
-    return " ".join(msg) if msg else "🟢 Low pest/disease risk based on recent weather conditions."
+# VARI health classes: < -0.1 | -0.1..0.1 | 0.1..0.2 | >= 0.2
+VARI_BINS = np.array([-0.1, 0.1, 0.2], dtype=np.float32)
+VARI_COLORS = [(215, 48, 39), (254, 224, 139), (145, 207, 96), (26, 152, 80)]
+VARI_PALETTE = [c for rgb in VARI_COLORS for c in rgb]
+VARI_LEGEND_HTML = " ".join(
+    f'<span style="color: rgb{rgb}">■</span> {label}'
+    for rgb, label in zip(VARI_COLORS, ["&lt; -0.1", "-0.1 – 0.1", "0.1 – 0.2", "≥ 0.2"])
+)
 
 
-def calculate_vari_from_file(uploaded_file) -> Tuple[Optional[float], Optional[plt.Figure]]:
+@st.cache_data(max_entries=16, show_spinner=False)
+def calculate_vari_from_bytes(file_bytes: bytes) -> Tuple[Optional[float], Optional[bytes]]:
+    """Returns (average VARI, PNG bytes of the health map) for an uploaded image."""
+    # imported lazily: only needed once a field image is uploaded
+    from PIL import Image
+
     try:
-        img = Image.open(uploaded_file).convert("RGB")
-        arr = np.array(img).astype(np.float32)
+        # verify() checks the header/structure without decoding pixels; the
+        # verified handle is unusable afterwards, so reopen for the real decode
+        Image.open(io.BytesIO(file_bytes)).verify()
+        img = Image.open(io.BytesIO(file_bytes))
+        # open() only parses the header, so the dimensions are known before any decode
+        if img.width * img.height > MAX_IMAGE_PIXELS:
+            return None, None
+        # JPEGs can be decoded straight at reduced scale (no-op for other formats)
+        img.draft("RGB", (1024, 1024))
+        # VARI is reported as an area average and shown at ~600px, so a 1024px
+        # thumbnail keeps the mean and the map while processing far fewer pixels;
+        # downscale before convert() so other formats are converted at thumbnail size
+        img.thumbnail((1024, 1024), Image.Resampling.BILINEAR)
+        img = img.convert("RGB")
+        # int16 holds G + R - B without overflow; the 1/255 scaling cancels in the ratio
+        arr = np.asarray(img, dtype=np.int16)
         if arr.ndim < 3 or arr.shape[2] < 3:
             return None, None
 
-        R = arr[:, :, 0] / 255.0
-        G = arr[:, :, 1] / 255.0
-        B = arr[:, :, 2] / 255.0
+        R = arr[:, :, 0]
+        G = arr[:, :, 1]
+        B = arr[:, :, 2]
 
         eps = 1e-6
-        denom = (G + R - B) + eps
-        vari = (G - R) / denom
-
-        valid = vari[np.isfinite(vari)]
-        valid = valid[(valid >= -1) & (valid <= 1)]
+        num = np.empty(R.shape, dtype=np.float32)
+        den = np.empty(R.shape, dtype=np.float32)
+        np.subtract(G, R, out=num, dtype=np.float32)
+        np.add(G, R, out=den, dtype=np.float32)
+        np.subtract(den, B, out=den)
+        den += eps
+        vari = np.divide(num, den, out=num)
+
+        # single pass: NaN/inf and out-of-range values all fail |v| <= 1
+        valid = vari[np.abs(vari) <= 1]
         avg_vari = float(np.mean(valid)) if valid.size else 0.0
 
-        fig, ax = plt.subplots(figsize=(6, 6))
-        cmap = colors.ListedColormap(["#d73027", "#fee08b", "#91cf60", "#1a9850"])
-        bounds = [-1, -0.1, 0.1, 0.2, 1.0]
-        norm = colors.BoundaryNorm(bounds, cmap.N)
-        im = ax.imshow(vari, cmap=cmap, norm=norm)
-        ax.set_title("Field Health Map (VARI)")
-        ax.axis("off")
-        fig.colorbar(im, ax=ax, orientation="horizontal", fraction=0.04, pad=0.04).set_label("VARI Value")
+        # bucket into the four health classes and encode straight to a palette PNG
+        idx = np.digitize(vari, VARI_BINS).astype(np.uint8)
+        health_map = Image.fromarray(idx)
+        health_map.putpalette(VARI_PALETTE)
 
-        return avg_vari, fig
+        buf = io.BytesIO()
+        health_map.save(buf, format="PNG")
+        return avg_vari, buf.getvalue()
     except Exception:
         return None, None
 
 
+@st.cache_data(ttl=600, show_spinner=False)
+def build_forecast_df(daily_tuple: tuple) -> pd.DataFrame:
+    """Builds the typed 7-day table from (dates, max temps, rain sums) tuples."""
+    dates, max_temps, rain = daily_tuple
+    return pd.DataFrame({
+        "Date": pd.to_datetime(pd.Series(dates, dtype="object"), errors="coerce"),
+        "Max T (°C)": pd.Series(max_temps, dtype="float32"),
+        "Rain (mm)": pd.Series(rain, dtype="float32"),
+    })
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def make_heatmap(lat: float, lon: float, points: np.ndarray) -> folium.Map:
+    """Builds the temperature heatmap; points is an (N, 3) array of (lat, lon, temp) rows."""
+    m = folium.Map(location=[float(lat), float(lon)], zoom_start=10, prefer_canvas=True)
+    HeatMap(points.tolist(), radius=25, blur=15, min_opacity=0.6).add_to(m)
+    return m
+
+
 # ---------------------------------------------------
 #                  MAIN APP UI
 # ---------------------------------------------------
@@ -296,26 +480,29 @@ with col1:
         st.markdown("### 🔥 Temperature Heatmap (approx last 24h)")
 
         if "heat_points" not in st.session_state or st.session_state.get("last_city") != city:
-            st.session_state.heat_points = []
             st.session_state.last_city = city
-            temps = [float(t) for t in temperatures if t is not None]
-            if not temps:
+            rng = get_rng()
+            temps_arr = np.asarray([t for t in temperatures if t is not None], dtype=np.float32)
+            if not temps_arr.size:
                 current_temp = weather_card.get("temperature", 28)
-                temps = [float(current_temp) + random.uniform(-2, 2) for _ in range(12)]
-
-            for _ in range(50):
-                t = random.choice(temps)
-                st.session_state.heat_points.append([
-                    float(lat) + random.uniform(-0.05, 0.05),
-                    float(lon) + random.uniform(-0.05, 0.05),
-                    float(t),
-                ])
-
-        if st.session_state.heat_points:
-            m = folium.Map(location=[float(lat), float(lon)], zoom_start=10)
-            HeatMap(st.session_state.heat_points, radius=25, blur=15, min_opacity=0.6).add_to(m)
-            map_html = m._repr_html_()
-            components.html(map_html, width=col1.width, height=500, scrolling=False)
+                temps_arr = (float(current_temp) + rng.uniform(-2, 2, 12)).astype(np.float32)
+
+            idx = rng.integers(0, len(temps_arr), 50)
+            lats = float(lat) + rng.uniform(-0.05, 0.05, 50)
+            lons = float(lon) + rng.uniform(-0.05, 0.05, 50)
+            # Streamlit hashes arrays by their bytes, so this keys the cached map directly
+            st.session_state.heat_points = np.stack([lats, lons, temps_arr[idx]], axis=1).astype(np.float32)
+
+        if st.session_state.heat_points.size:
+            heatmap = make_heatmap(lat, lon, st.session_state.heat_points)
+            # returned_objects=[] keeps pan/zoom from triggering reruns
+            st_folium(
+                heatmap,
+                height=500,
+                use_container_width=True,
+                returned_objects=[],
+                key=f"heatmap-{city}",
+            )
         else:
             st.info("Heatmap data unavailable.")
     else:
@@ -334,12 +521,16 @@ with col2:
     if show_forecast and open_data and "daily" in open_data:
         st.markdown("### 📅 7-Day Summary")
         daily = open_data.get("daily", {})
-        df = pd.DataFrame({
-            "Date": daily.get("time", [])[:7],
-            "Max T (°C)": daily.get("temperature_2m_max", [])[:7],
-            "Rain (mm)": daily.get("precipitation_sum", [])[:7],
-        })
-        st.dataframe(df, width="stretch")
+        df = build_forecast_df((
+            tuple(daily.get("time", [])[:7]),
+            tuple(daily.get("temperature_2m_max", [])[:7]),
+            tuple(daily.get("precipitation_sum", [])[:7]),
+        ))
+        st.dataframe(
+            df,
+            width="stretch",
+            column_config={"Date": st.column_config.DateColumn(format="YYYY-MM-DD")},
+        )
     elif show_forecast:
         st.info("Forecast not available.")
 
@@ -382,12 +573,20 @@ with col3:
         "Upload a **standard color image (PNG/JPEG)** of your field:", type=["png", "jpg", "jpeg"]
     )
 
-    if uploaded_file is not None:
+    if uploaded_file is not None and uploaded_file.size > MAX_UPLOAD_BYTES:
+        st.error(f"Image too large — please upload a file under {MAX_UPLOAD_BYTES // 1_000_000} MB.")
+    elif uploaded_file is not None:
         with st.spinner("Processing image... Calculating VARI."):
-            avg_vari, fig = calculate_vari_from_file(uploaded_file)
-        if avg_vari is not None and fig is not None:
+            avg_vari, map_png = calculate_vari_from_bytes(uploaded_file.getvalue())
+        if avg_vari is None or map_png is None:
+            st.error(
+                "Could not read this image — please upload a valid PNG or JPEG "
+                f"of at most {MAX_IMAGE_PIXELS // 1_000_000} megapixels."
+            )
+        else:
             st.markdown("#### Land Health Results")
-            st.pyplot(fig)
+            st.image(map_png, caption="Field Health Map (VARI)")
+            st.markdown(VARI_LEGEND_HTML, unsafe_allow_html=True)
             st.markdown(f"#### Average VARI: **{avg_vari:.3f}**")
             if avg_vari >= 0.20:
                 st.success("✨ **EXCELLENT HEALTH!** High uniformity and dense vegetation.")